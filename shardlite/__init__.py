@@ -87,6 +87,7 @@ __all__ = [
     "TransactionEvent",
     "ConsoleTransactionLogger",
     "NullTransactionLogger",
+    "NULL_LOGGER",
     "TransactionMetrics",
     "ParallelTransactionCoordinator",
     "TransactionContext",
@@ -85,6 +85,7 @@ from .transaction.logger import (
     TransactionEvent,
     ConsoleTransactionLogger,
     NullTransactionLogger,
+    NULL_LOGGER,
     TransactionMetrics,
 )
 from .transaction.coordinator import (
@@ -163,6 +164,7 @@ __all__ = [
     "TransactionEvent",
     "ConsoleTransactionLogger",
     "NullTransactionLogger",
+    "NULL_LOGGER",
     "TransactionMetrics",
     "ParallelTransactionCoordinator",
     "Transaction",
@@ -30,15 +30,16 @@ class ConnectionPool:
     Attributes:
         db_path (str): Path to the SQLite database file
         max_connections (int): Hard limit on active connections (not pool size)
-        timeout (int): Connection timeout in seconds when pool is exhausted
+        timeout (float): Connection timeout in seconds when pool is exhausted
     """
     
     def __init__(
         self, 
         db_path: str, 
         max_connections: int = 10,
-        timeout: int = 30,
-        check_same_thread: bool = False
+        timeout: float = 30,
+        check_same_thread: bool = False,
+        uri: bool = False
     ) -> None:
         """
         Initialize connection pool.
@@ -48,6 +49,7 @@ class ConnectionPool:
             max_connections: Hard limit on active connections (not pool size)
             timeout: Connection timeout in seconds when pool is exhausted
             check_same_thread: Whether to check if connections are used in same thread
+            uri: Whether db_path is a SQLite URI (e.g. a shared-cache in-memory database)
             
         Raises:
             ValueError: If parameters are invalid
@@ -58,13 +60,14 @@ class ConnectionPool:
         if not isinstance(max_connections, int) or max_connections <= 0:
             raise ValueError("max_connections must be a positive integer")
         
-        if not isinstance(timeout, int) or timeout <= 0:
-            raise ValueError("timeout must be a positive integer")
+        if not isinstance(timeout, (int, float)) or timeout <= 0:
+            raise ValueError("timeout must be a positive number")
         
         self.db_path = db_path
         self.max_connections = max_connections
         self.timeout = timeout
         self.check_same_thread = check_same_thread
+        self.uri = uri
         
         # Thread-safe connection pool
         self._pool: Queue[sqlite3.Connection] = Queue(maxsize=max_connections)
@@ -223,7 +226,8 @@ class ConnectionPool:
         conn = sqlite3.connect(
             self.db_path,
             timeout=self.timeout,
-            check_same_thread=self.check_same_thread
+            check_same_thread=self.check_same_thread,
+            uri=self.uri
         )
         
         # Configure connection
@@ -11,7 +11,7 @@ class TransactionConnectionPool(ConnectionPool):
     TransactionConnectionPool extends ConnectionPool for transaction-aware connection management.
     Holds connections for the duration of a transaction and supports isolation.
     """
-    def __init__(self, db_path: str, max_connections: int = 10, timeout: int = 30, check_same_thread: bool = False):
+    def __init__(self, db_path: str, max_connections: int = 10, timeout: float = 30, check_same_thread: bool = False):
         super().__init__(db_path, max_connections, timeout, check_same_thread)
         # Additional state for transaction management can be added here
 
@@ -13,7 +13,7 @@ from .strategy.hash_strategy import HashShardingStrategy
 from .strategy.base import ShardingStrategy
 from .router.router import Router
 from .transaction.coordinator import ParallelTransactionCoordinator
-from .transaction.logger import TransactionLogger, NullTransactionLogger
+from .transaction.logger import TransactionLogger, NULL_LOGGER
 
 
 class ShardManager:
@@ -77,7 +77,7 @@ class ShardManager:
             self.strategy = strategy
         
         # Initialize transaction logger
-        self.logger = logger or NullTransactionLogger()
+        self.logger = logger or NULL_LOGGER
         
         # Initialize components
         self.router = Router(self, self.strategy)
@@ -290,8 +290,16 @@ class ShardManager:
         # Use provided logger or default
         tx_logger = logger or self.logger
         
-        # Create transaction coordinator with specific logger
-        coordinator = ParallelTransactionCoordinator(self, tx_logger)
+        if tx_logger is self.logger:
+            # The manager's coordinator already uses this logger; reusing it
+            # keeps its worker pool unstarted until a transaction needs it
+            coordinator = self.coordinator
+        else:
+            # Create transaction coordinator with specific logger, borrowing the
+            # manager's worker pool (started only if this transaction needs it)
+            coordinator = ParallelTransactionCoordinator(
+                self, tx_logger, parent=self.coordinator
+            )
         
         return coordinator.begin(shard_keys)
     
@@ -402,6 +402,86 @@ class Router:
         
         return results
     
+    def route_multi_aggregate(self, table: str, agg_exprs: List[str]) -> Dict[str, Any]:
+        """
+        Route several aggregates across all shards with one query per shard.
+        
+        All expressions are evaluated in a single SELECT on each shard and the
+        partial results are merged like route_aggregate() merges them: COUNT
+        and SUM are added (shards with a NULL partial are skipped), MAX/MIN keep
+        the extreme value, and AVG is rebuilt from per-shard SUM and COUNT so
+        each shard is weighted by its rows.
+        
+        Args:
+            table: Source table name
+            agg_exprs: Aggregation expressions (e.g., ["COUNT(*)", "AVG(amount)"])
+            
+        Returns:
+            Dict[str, Any]: Aggregation results keyed by expression
+            
+        Raises:
+            ValueError: If parameters are invalid
+            sqlite3.Error: If database operation fails
+        """
+        if not table or not isinstance(table, str):
+            raise ValueError("table must be a non-empty string")
+        
+        if not agg_exprs or not all(expr and isinstance(expr, str) for expr in agg_exprs):
+            raise ValueError("agg_exprs must be a non-empty list of non-empty strings")
+        
+        # Build one select list; AVG contributes a SUM and a COUNT column
+        columns: List[str] = []
+        agg_types: List[str] = []
+        for agg_expr in agg_exprs:
+            agg_type = agg_expr.upper().split('(')[0]
+            agg_types.append(agg_type)
+            if agg_type in ['AVG', 'AVERAGE']:
+                column = agg_expr[agg_expr.find('(')+1:agg_expr.find(')')]
+                columns.extend([f"SUM({column})", f"COUNT({column})"])
+            else:
+                columns.append(agg_expr)
+        sql = f"SELECT {', '.join(columns)} FROM {table}"
+        
+        shard_rows = []
+        for shard_id in self.strategy.get_all_shard_ids():
+            connection_pool = self._get_connection_pool(shard_id)
+            
+            with connection_pool.get_connection_context() as conn:
+                shard_rows.append(conn.execute(sql).fetchone())
+        
+        # Merge the per-shard partials column by column
+        results: Dict[str, Any] = {}
+        col = 0
+        for agg_expr, agg_type in zip(agg_exprs, agg_types):
+            if agg_type in ['AVG', 'AVERAGE']:
+                total_sum = sum(row[col] or 0 for row in shard_rows)
+                total_count = sum(row[col + 1] or 0 for row in shard_rows)
+                results[agg_expr] = total_sum / total_count if total_count > 0 else 0
+                col += 2
+                continue
+            
+            values = [row[col] for row in shard_rows if row[col] is not None]
+            if agg_type == 'MAX':
+                results[agg_expr] = max(values) if values else None
+            elif agg_type == 'MIN':
+                results[agg_expr] = min(values) if values else None
+            else:
+                results[agg_expr] = self._combine_partials(values)
+            col += 1
+        
+        return results
+    
+    @staticmethod
+    def _combine_partials(values: List[Any]) -> Any:
+        """Add numeric per-shard partials; a non-numeric value replaces the running result."""
+        result = None
+        for value in values:
+            if isinstance(value, (int, float)) and isinstance(result, (int, float)):
+                result += value
+            else:
+                result = value
+        return result
+    
     def get_connection_for_key(self, key: int) -> ConnectionPool:
         """
         Get connection pool for a specific key.
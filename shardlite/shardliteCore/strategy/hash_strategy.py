@@ -39,6 +39,13 @@ class HashShardingStrategy(ShardingStrategy):
             raise ValueError(f"num_shards must be a positive integer, got {num_shards}")
         
         self._num_shards = num_shards
+        
+        # For power-of-two shard counts, key % num_shards == key & (num_shards - 1)
+        self._mask = num_shards - 1 if num_shards & (num_shards - 1) == 0 else None
+        
+        # Strategies are immutable, so the hash is computed once; this keeps
+        # them cheap to use as keys in routing caches
+        self._hash = hash(("HashShardingStrategy", num_shards))
     
     def get_shard_id(self, key: int) -> int:
         """
@@ -56,6 +63,8 @@ class HashShardingStrategy(ShardingStrategy):
         if not self.validate_key(key):
             raise ValueError(f"Key must be an integer, got {type(key)}")
         
+        if self._mask is not None:
+            return abs(key) & self._mask
         return abs(key) % self._num_shards
     
     def get_shard_range(self, start_key: int, end_key: int) -> List[int]:
@@ -164,4 +173,4 @@ class HashShardingStrategy(ShardingStrategy):
     
     def __hash__(self) -> int:
         """Return hash value for this strategy."""
-        return hash(self._num_shards) 
\ No newline at end of file
+        return self._hash 
\ No newline at end of file
@@ -3,6 +3,7 @@ Transaction classes for Shardlite transactional operations.
 
 Defines the Transaction base class (state/lifecycle) and OperationStager child class (operation staging, CRUD).
 """
+import time
 from typing import Set, List, Dict, Any, Callable, Optional
 from .transaction_states import TransactionState
 
@@ -11,12 +12,19 @@ class Transaction:
     Base Transaction class: manages transaction state, involved shards, and held connections.
     Does not implement operation staging or CRUD.
     """
-    def __init__(self, coordinator, logger=None):
+    def __init__(self, coordinator, logger=None, transaction_id: Optional[str] = None):
         self.coordinator = coordinator
         self.logger = logger
+        self.transaction_id = transaction_id
         self.involved_shards: Set[int] = set()
         self.connections: Dict[int, Any] = {}  # int: shard_id -> Connection
         self.state: TransactionState = TransactionState.INITIAL
+        self.start_time_ns: int = time.perf_counter_ns()  # monotonic start, for duration only
+        self.ops_by_shard: Dict[Optional[int], List[Callable]] = {}  # shard_id (None: not shard-scoped) -> staged operations
+
+    def add_operation(self, operation: Callable, shard_id: Optional[int] = None):
+        """Stage an operation under the shard it targets (None if it is not tied to a shard)."""
+        self.ops_by_shard.setdefault(shard_id, []).append(operation)
 
     def commit(self):
         """Commit the transaction using the coordinator (2PC)."""
@@ -43,8 +51,8 @@ class OperationStager(Transaction):
     All transactional CRUD operations should be performed via this class.
     Includes a 'prepared' flag to indicate if all operations were staged successfully for 2PC.
     """
-    def __init__(self, coordinator, logger=None):
-        super().__init__(coordinator, logger)
+    def __init__(self, coordinator, logger=None, transaction_id: Optional[str] = None):
+        super().__init__(coordinator, logger, transaction_id)
         self.staged_operations: List[Dict[str, Any]] = []  # Each op: {'type': str, 'args': tuple, 'kwargs': dict}
         self.current_state: Dict[str, Any] = {}
         self.prepared: bool = True  # True if all operations staged successfully
@@ -53,7 +61,7 @@ class OperationStager(Transaction):
         """Mark the transaction as unprepared (staging failed). Optionally log the reason."""
         self.prepared = False
         if self.logger:
-            self.logger.on_error(getattr(self, 'transaction_id', None), reason)
+            self.logger.on_error(self.transaction_id, reason)
 
     def insert(self, table: str, row: Dict[str, Any], key: int):
         """Stage an insert operation for the given table and key."""
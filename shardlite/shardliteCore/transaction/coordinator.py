@@ -5,15 +5,29 @@ This module provides the ParallelTransactionCoordinator class that implements
 the Two-Phase Commit (2PC) protocol for cross-shard transactions.
 """
 
+import os
 import time
+import itertools
 import threading
-import uuid
-from typing import Dict, List, Any, Optional, Callable, Union
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from .logger import TransactionLogger, NullTransactionLogger
+from typing import Dict, List, Any, Optional, Callable, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from .logger import TransactionLogger, NULL_LOGGER
 from .transaction_states import TransactionState
 from .context import Transaction
 
+# Statement that opens each shard's write transaction. Named once so the
+# prepare and one-phase commit paths stay in sync; re-parsing is avoided by
+# sqlite3's per-connection statement cache, which is keyed by SQL text and so
+# hits for any equal string, constant or literal.
+_BEGIN_IMMEDIATE_SQL = "BEGIN IMMEDIATE"
+
+# Transaction ID sequence shared by every coordinator in the process, so IDs
+# stay unique when ShardManager.transaction() builds per-logger coordinators
+_tx_counter = itertools.count()
+
+# States in which rollback() has nothing left to do
+_FINALIZED_STATES = frozenset({TransactionState.COMMITTED, TransactionState.ROLLED_BACK})
+
 
 class ParallelTransactionCoordinator:
     """
@@ -31,7 +45,9 @@ class ParallelTransactionCoordinator:
         self, 
         shard_manager: 'ShardManager',
         logger: Optional[TransactionLogger] = None,
-        max_workers: int = 4
+        max_workers: int = 4,
+        executor: Optional[ThreadPoolExecutor] = None,
+        parent: Optional['ParallelTransactionCoordinator'] = None
     ) -> None:
         """
         Initialize transaction coordinator.
@@ -39,7 +55,14 @@ class ParallelTransactionCoordinator:
         Args:
             shard_manager: ShardManager instance for accessing shards
             logger: Optional transaction logger for monitoring
-            max_workers: Maximum number of worker threads for parallel operations
+            max_workers: Minimum number of worker threads for parallel operations;
+                the owned pool grows to the shard count so every shard can be
+                prepared concurrently
+            executor: Optional executor to share between coordinators. An
+                injected executor is not shut down by shutdown().
+            parent: Optional coordinator whose worker pool this one borrows.
+                The parent's pool is only started when this coordinator
+                first needs it, and shutdown() leaves it to the parent.
             
         Raises:
             ValueError: If parameters are invalid
@@ -48,14 +71,36 @@ class ParallelTransactionCoordinator:
             raise ValueError("shard_manager cannot be None")
         
         self.shard_manager = shard_manager
-        self.logger = logger or NullTransactionLogger()
-        self.max_workers = max_workers
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.logger = logger or NULL_LOGGER
+        
+        # The owned executor is created on first use, so coordinators that
+        # only ever see single-shard transactions never start worker threads
+        if parent is not None:
+            self.max_workers = parent.max_workers
+        elif executor is not None:
+            self.max_workers = max_workers
+        else:
+            self.max_workers = max(max_workers, shard_manager.strategy.get_num_shards())
+        self._owns_executor = executor is None and parent is None
+        self._executor = executor
+        self._parent = parent
+        self._executor_lock = threading.Lock()
         
         # Transaction tracking
         self.active_transactions: Dict[str, Transaction] = {}
         self.transaction_lock = threading.RLock()
     
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Worker pool for parallel phases, created on first access if not injected."""
+        if self._executor is None:
+            if self._parent is not None:
+                return self._parent.executor
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+    
     def begin(self, shard_keys: List[int]) -> Transaction:
         """
         Begin a new cross-shard transaction.
@@ -72,8 +117,9 @@ class ParallelTransactionCoordinator:
         if not shard_keys:
             raise ValueError("shard_keys cannot be empty")
         
-        transaction_id = str(uuid.uuid4())
-        context = Transaction(self, transaction_id)
+        # The pid is read per call so a forked child does not reuse the parent's IDs
+        transaction_id = f"{os.getpid()}-{next(_tx_counter)}"
+        context = Transaction(self, self.logger, transaction_id=transaction_id)
         context.shard_keys = shard_keys.copy()
         context.state = TransactionState.INITIAL
         
@@ -122,6 +168,11 @@ class ParallelTransactionCoordinator:
             bool: True if commit was successful, False otherwise
         """
         if context.state == TransactionState.INITIAL:
+            if len(self._shard_representatives(context.shard_keys)) == 1:
+                # A single participating shard needs no 2PC vote, however
+                # many of the keys map to it
+                return self._commit_single_shard(context)
+            
             # Auto-prepare if not already prepared
             if not self.prepare(context):
                 return False
@@ -144,7 +195,7 @@ class ParallelTransactionCoordinator:
             context.state = TransactionState.FAILED
         
         # Log completion
-        duration_ms = (time.time() - context.start_time) * 1000
+        duration_ms = (time.perf_counter_ns() - context.start_time_ns) / 1_000_000
         self.logger.on_complete(context.transaction_id, context.state, duration_ms)
         
         # Cleanup
@@ -152,6 +203,60 @@ class ParallelTransactionCoordinator:
         
         return all_committed
     
+    def _commit_single_shard(self, context: Transaction) -> bool:
+        """
+        Commit a single-shard transaction in one phase on the calling thread.
+        
+        Skips the PREPARING/PREPARED transitions and the executor, since
+        BEGIN IMMEDIATE + COMMIT on one connection is already atomic.
+        
+        No staged operations are run here. As on the two-phase path, commit()
+        only finalizes the transaction; run() (or the caller) executes the
+        operations beforehand. They write through their own pooled
+        connections, so running them while this connection holds the
+        BEGIN IMMEDIATE write lock would block on the shard's lock.
+        
+        Args:
+            context: Transaction context whose keys all map to one shard
+            
+        Returns:
+            bool: True if commit was successful, False otherwise
+        """
+        shard_key = context.shard_keys[0]
+        context.state = TransactionState.COMMITTING
+        self.logger.on_commit(context.transaction_id, context.shard_keys)
+        
+        try:
+            connection_pool = self.shard_manager.router.get_connection_for_key(shard_key)
+            
+            with connection_pool.get_connection_context() as conn:
+                if conn.in_transaction:
+                    # Left open by an earlier failure; start from a clean connection
+                    conn.rollback()
+                try:
+                    conn.execute(_BEGIN_IMMEDIATE_SQL)
+                    conn.commit()
+                except Exception:
+                    # Never hand a connection back to the pool mid-transaction
+                    if conn.in_transaction:
+                        conn.rollback()
+                    raise
+            committed = True
+        except Exception as e:
+            self.logger.on_error(context.transaction_id, e, shard_key=shard_key)
+            committed = False
+        
+        context.state = TransactionState.COMMITTED if committed else TransactionState.FAILED
+        
+        # Log completion
+        duration_ms = (time.perf_counter_ns() - context.start_time_ns) / 1_000_000
+        self.logger.on_complete(context.transaction_id, context.state, duration_ms)
+        
+        # Cleanup
+        self._cleanup_transaction(context)
+        
+        return committed
+    
     def rollback(self, context: Transaction) -> None:
         """
         Rollback the transaction.
@@ -159,7 +264,7 @@ class ParallelTransactionCoordinator:
         Args:
             context: Transaction context
         """
-        if context.state in [TransactionState.COMMITTED, TransactionState.ROLLED_BACK]:
+        if context.state in _FINALIZED_STATES:
             return  # Already finalized
         
         context.state = TransactionState.ROLLING_BACK
@@ -171,35 +276,110 @@ class ParallelTransactionCoordinator:
         context.state = TransactionState.ROLLED_BACK
         
         # Log completion
-        duration_ms = (time.time() - context.start_time) * 1000
+        duration_ms = (time.perf_counter_ns() - context.start_time_ns) / 1_000_000
         self.logger.on_complete(context.transaction_id, context.state, duration_ms)
         
         # Cleanup
         self._cleanup_transaction(context)
     
-    def run(self, shard_keys: List[int], operations: List[Callable]) -> bool:
+    def run(
+        self,
+        shard_keys: List[int],
+        operations: List[Union[Callable, Tuple[int, Callable]]]
+    ) -> bool:
         """
         Run a transaction with the given operations.
         
+        Operations passed as ``(shard_key, operation)`` tuples are grouped by
+        shard and each shard's group is drained on its own worker, so the
+        transaction costs one dispatch per shard rather than one per operation.
+        Bare callables are not tied to a shard and run on the calling thread
+        before the per-shard groups; if one fails, no group is started. If a
+        group fails, run() still waits for the other groups to finish and
+        reports every error to the logger. The transaction is then committed
+        if every operation succeeded and rolled back otherwise.
+        
         Args:
             shard_keys: List of shard keys involved in the transaction
-            operations: List of operations to execute
+            operations: List of operations (or (shard_key, operation) pairs) to execute
             
         Returns:
             bool: True if transaction was successful, False otherwise
         """
-        with self.begin(shard_keys) as context:
-            for operation in operations:
-                context.add_operation(operation)
+        context = self.begin(shard_keys)
+        
+        # Transaction.__exit__ does not finalize through the coordinator, so
+        # commit or roll back explicitly
+        try:
+            succeeded = self._execute_operations(context, operations)
+        except BaseException:
+            self.rollback(context)
+            raise
+        
+        if not succeeded:
+            self.rollback(context)
+            return False
+        return self.commit(context)
+    
+    def _execute_operations(
+        self,
+        context: Transaction,
+        operations: List[Union[Callable, Tuple[int, Callable]]]
+    ) -> bool:
+        """
+        Stage and execute run()'s operations, logging every failure.
+        
+        Args:
+            context: Transaction context
+            operations: List of operations (or (shard_key, operation) pairs) to execute
             
-            # Execute operations
-            try:
-                for operation in operations:
-                    operation()
-                return True
-            except Exception as e:
-                self.logger.on_error(context.transaction_id, e)
-                return False
+        Returns:
+            bool: True if every operation succeeded, False otherwise
+        """
+        strategy = self.shard_manager.strategy
+        
+        for operation in operations:
+            if isinstance(operation, tuple):
+                shard_key, operation = operation
+                context.add_operation(operation, strategy.get_shard_id(shard_key))
+            else:
+                context.add_operation(operation)
+        
+        # Execute operations
+        try:
+            for operation in context.ops_by_shard.get(None, ()):
+                operation()
+        except Exception as e:
+            self.logger.on_error(context.transaction_id, e)
+            return False
+        
+        futures = [
+            self.executor.submit(self._drain_operations, shard_ops)
+            for shard_id, shard_ops in context.ops_by_shard.items()
+            if shard_id is not None
+        ]
+        
+        # Let every shard finish before reporting, so no group is still
+        # writing after run() has returned
+        wait(futures)
+        succeeded = True
+        for future in futures:
+            error = future.exception()
+            if error is not None:
+                self.logger.on_error(context.transaction_id, error)
+                succeeded = False
+        return succeeded
+    
+    @staticmethod
+    def _drain_operations(operations: List[Callable]) -> None:
+        """
+        Execute one shard's staged operations in order.
+        
+        Args:
+            operations: Operations staged for a single shard
+        """
+        for operation in operations:
+            operation()
     
     def _execute_prepare_phase(self, context: Transaction) -> Dict[int, bool]:
         """
@@ -215,7 +395,7 @@ class ParallelTransactionCoordinator:
         prepare_results = {}
         
         # Submit prepare tasks
-        for shard_key in context.shard_keys:
+        for shard_key in self._shard_representatives(context.shard_keys):
             future = self.executor.submit(self._prepare_shard, context.transaction_id, shard_key)
             futures[future] = shard_key
         
@@ -246,13 +426,13 @@ class ParallelTransactionCoordinator:
         commit_results = {}
         
         # Submit commit tasks
-        for shard_key in context.shard_keys:
+        for shard_key in self._shard_representatives(context.shard_keys):
             future = self.executor.submit(self._commit_shard, context.transaction_id, shard_key)
             futures[future] = shard_key
         
-        # Collect results
-        for future in as_completed(futures):
-            shard_key = futures[future]
+        # Wait for the whole batch once, then collect results
+        wait(futures)
+        for future, shard_key in futures.items():
             try:
                 result = future.result()
                 commit_results[shard_key] = result
@@ -272,7 +452,7 @@ class ParallelTransactionCoordinator:
         futures = []
         
         # Submit rollback tasks
-        for shard_key in context.shard_keys:
+        for shard_key in self._shard_representatives(context.shard_keys):
             future = self.executor.submit(self._rollback_shard, context.transaction_id, shard_key)
             futures.append(future)
         
@@ -300,13 +480,9 @@ class ParallelTransactionCoordinator:
             connection_pool = self.shard_manager.router.get_connection_for_key(shard_key)
             
             with connection_pool.get_connection_context() as conn:
-                # Begin immediate transaction
-                conn.execute("BEGIN IMMEDIATE")
-                
-                # Write rollback journal (SQLite does this automatically)
-                # For now, we just verify the connection is ready
-                conn.execute("SELECT 1")
-                
+                # Begin immediate transaction; this takes the write lock and
+                # fails fast on a dead connection, so no separate ping is needed
+                conn.execute(_BEGIN_IMMEDIATE_SQL)
                 return True
         except Exception as e:
             self.logger.on_error(transaction_id, e, shard_key=shard_key)
@@ -353,6 +529,25 @@ class ParallelTransactionCoordinator:
         except Exception as e:
             self.logger.on_error(transaction_id, e, shard_key=shard_key)
     
+    def _shard_representatives(self, shard_keys: List[int]) -> List[int]:
+        """
+        Pick one key per distinct shard, in first-seen order.
+        
+        Each phase touches a shard once: a second BEGIN IMMEDIATE on a shard
+        that is already prepared would fail.
+        
+        Args:
+            shard_keys: Shard keys involved in the transaction
+            
+        Returns:
+            List[int]: The first key seen for each shard
+        """
+        get_shard_id = self.shard_manager.strategy.get_shard_id
+        representatives: Dict[int, int] = {}
+        for shard_key in shard_keys:
+            representatives.setdefault(get_shard_id(shard_key), shard_key)
+        return list(representatives.values())
+    
     def _cleanup_transaction(self, context: Transaction) -> None:
         """
         Clean up transaction resources.
@@ -379,9 +574,11 @@ class ParallelTransactionCoordinator:
         Shutdown the transaction coordinator.
         
         This method should be called when the coordinator is no longer needed
-        to properly clean up resources.
+        to properly clean up resources. Only an executor created by this
+        coordinator is shut down; an injected executor belongs to its owner.
         """
-        self.executor.shutdown(wait=True)
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True)
     
     def __repr__(self) -> str:
         """Return string representation of the coordinator."""
@@ -5,9 +5,94 @@ This module defines the TransactionLogger protocol that provides an interface
 for logging transaction lifecycle events and monitoring transaction status.
 """
 
+import sys
+import time
+import array
+import queue
+import atexit
+import weakref
+import threading
 from typing import Protocol, Dict, Any, Optional, List
-from .types import TransactionState, TransactionEvent
-from datetime import datetime
+from .transaction_states import TransactionState, TransactionEvent
+
+
+# (epoch second, formatted "YYYY-MM-DDTHH:MM:SS") of the last log call; replaced
+# as one tuple so concurrent loggers never see a mismatched pair
+_ts_cache = (0, '')
+
+
+def _timestamp() -> str:
+    """Return an ISO-8601 local timestamp, formatting the date part at most once per second."""
+    global _ts_cache
+    now = time.time()
+    sec = int(now)
+    cached_sec, prefix = _ts_cache
+    if sec != cached_sec:
+        prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(sec))
+        _ts_cache = (sec, prefix)
+    return f"{prefix}.{int((now - sec) * 1_000_000):06d}"
+
+
+# Maximum number of queued lines joined into one stdout write
+_WRITE_BATCH_SIZE = 64
+
+
+def _drain_to_stdout(lines: "queue.SimpleQueue") -> None:
+    """
+    Write queued log lines to stdout in batches until a None sentinel arrives.
+    
+    threading.Event items are flush markers: they are set once every line
+    queued before them has been written.
+    """
+    while True:
+        item = lines.get()
+        batch: List[str] = []
+        flushed: List[threading.Event] = []
+        stop = False
+        while True:
+            if item is None:
+                stop = True
+                break
+            if isinstance(item, threading.Event):
+                flushed.append(item)
+            else:
+                batch.append(item)
+                if len(batch) >= _WRITE_BATCH_SIZE:
+                    break
+            try:
+                item = lines.get_nowait()
+            except queue.Empty:
+                break
+        
+        if batch:
+            sys.stdout.write("\n".join(batch) + "\n")
+        if flushed or stop:
+            sys.stdout.flush()
+        for event in flushed:
+            event.set()
+        if stop:
+            return
+
+
+def _flush_queue(lines: "queue.SimpleQueue", writer: threading.Thread, timeout: float = 1.0) -> None:
+    """Block until every line queued so far has been written (or timeout expires)."""
+    if not writer.is_alive():
+        return
+    done = threading.Event()
+    lines.put(done)
+    done.wait(timeout)
+
+
+# Console loggers still alive; flushed once at interpreter exit. Held weakly so
+# the exit hook never keeps a logger (or its queue and writer) alive.
+_live_loggers: "weakref.WeakSet[ConsoleTransactionLogger]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_loggers() -> None:
+    """Write out pending lines of every live console logger."""
+    for logger in list(_live_loggers):
+        logger.flush()
 
 
 class TransactionLogger(Protocol):
@@ -102,6 +187,15 @@ class ConsoleTransactionLogger:
     and debugging purposes.
     """
     
+    # Line templates, filled with the % operator
+    _PREPARE_FMT = "[%s] TX %s: PREPARE phase started for shards %s"
+    _VOTE_FMT = "[%s] TX %s: Shard %s voted %s"
+    _COMMIT_FMT = "[%s] TX %s: COMMIT phase started for shards %s"
+    _ROLLBACK_FMT = "[%s] TX %s: ROLLBACK for shards %s - %s"
+    _COMPLETE_FMT = "[%s] TX %s: COMPLETED with state %s in %.2fms"
+    _ERROR_FMT = "[%s] TX %s: ERROR - %s: %s"
+    _CONTEXT_FMT = "%s\n  Context: %s"
+    
     def __init__(self, verbose: bool = True) -> None:
         """
         Initialize console transaction logger.
@@ -110,49 +204,65 @@ class ConsoleTransactionLogger:
             verbose: Whether to output detailed information
         """
         self.verbose = verbose
+        
+        # Lines are handed to a daemon writer thread that batches them into
+        # single stdout writes; only the queue is shared with it (not self) so
+        # the logger can still be garbage collected
+        self._q: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._writer = threading.Thread(
+            target=_drain_to_stdout, args=(self._q,),
+            name="ConsoleTransactionLogger-writer", daemon=True
+        )
+        self._writer.start()
+        _live_loggers.add(self)
+    
+    def _emit(self, line: str, kwargs: Dict[str, Any]) -> None:
+        """Queue a log line, plus its context line in verbose mode."""
+        if self.verbose and kwargs:
+            line = self._CONTEXT_FMT % (line, kwargs)
+        self._q.put(line)
+    
+    def flush(self) -> None:
+        """Block until all queued log lines have been written to stdout."""
+        _flush_queue(self._q, self._writer)
+    
+    def __del__(self) -> None:
+        """Stop the writer thread once pending lines are written."""
+        q = getattr(self, '_q', None)
+        if q is not None:
+            q.put(None)
     
     def on_prepare(self, transaction_id: str, shard_keys: List[int], **kwargs: Any) -> None:
         """Log transaction prepare phase start."""
-        timestamp = datetime.now().isoformat()
-        print(f"[{timestamp}] TX {transaction_id}: PREPARE phase started for shards {shard_keys}")
-        if self.verbose and kwargs:
-            print(f"  Context: {kwargs}")
+        shards = ','.join(map(str, shard_keys))
+        self._emit(self._PREPARE_FMT % (_timestamp(), transaction_id, shards), kwargs)
     
     def on_vote(self, transaction_id: str, shard_id: int, vote: bool, **kwargs: Any) -> None:
         """Log shard vote during prepare phase."""
-        timestamp = datetime.now().isoformat()
         vote_str = "YES" if vote else "NO"
-        print(f"[{timestamp}] TX {transaction_id}: Shard {shard_id} voted {vote_str}")
-        if self.verbose and kwargs:
-            print(f"  Context: {kwargs}")
+        self._emit(self._VOTE_FMT % (_timestamp(), transaction_id, shard_id, vote_str), kwargs)
     
     def on_commit(self, transaction_id: str, shard_keys: List[int], **kwargs: Any) -> None:
         """Log transaction commit phase start."""
-        timestamp = datetime.now().isoformat()
-        print(f"[{timestamp}] TX {transaction_id}: COMMIT phase started for shards {shard_keys}")
-        if self.verbose and kwargs:
-            print(f"  Context: {kwargs}")
+        shards = ','.join(map(str, shard_keys))
+        self._emit(self._COMMIT_FMT % (_timestamp(), transaction_id, shards), kwargs)
     
     def on_rollback(self, transaction_id: str, shard_keys: List[int], reason: str, **kwargs: Any) -> None:
         """Log transaction rollback."""
-        timestamp = datetime.now().isoformat()
-        print(f"[{timestamp}] TX {transaction_id}: ROLLBACK for shards {shard_keys} - {reason}")
-        if self.verbose and kwargs:
-            print(f"  Context: {kwargs}")
+        shards = ','.join(map(str, shard_keys))
+        self._emit(self._ROLLBACK_FMT % (_timestamp(), transaction_id, shards, reason), kwargs)
     
     def on_complete(self, transaction_id: str, state: TransactionState, duration_ms: float, **kwargs: Any) -> None:
         """Log transaction completion."""
-        timestamp = datetime.now().isoformat()
-        print(f"[{timestamp}] TX {transaction_id}: COMPLETED with state {state.value} in {duration_ms:.2f}ms")
-        if self.verbose and kwargs:
-            print(f"  Context: {kwargs}")
+        self._emit(self._COMPLETE_FMT % (_timestamp(), transaction_id, state.name, duration_ms), kwargs)
     
     def on_error(self, transaction_id: str, error: Exception, **kwargs: Any) -> None:
         """Log transaction error."""
-        timestamp = datetime.now().isoformat()
-        print(f"[{timestamp}] TX {transaction_id}: ERROR - {type(error).__name__}: {error}")
-        if self.verbose and kwargs:
-            print(f"  Context: {kwargs}")
+        self._emit(self._ERROR_FMT % (_timestamp(), transaction_id, type(error).__name__, error), kwargs)
+
+
+def _noop(*args: Any, **kwargs: Any) -> None:
+    """No-op implementation."""
 
 
 class NullTransactionLogger:
@@ -161,31 +271,36 @@ class NullTransactionLogger:
     
     This logger can be used when no logging is desired, providing
     a no-op implementation of the TransactionLogger protocol.
-    """
-    
-    def on_prepare(self, transaction_id: str, shard_keys: List[int], **kwargs: Any) -> None:
-        """No-op implementation."""
-        pass
-    
-    def on_vote(self, transaction_id: str, shard_id: int, vote: bool, **kwargs: Any) -> None:
-        """No-op implementation."""
-        pass
-    
-    def on_commit(self, transaction_id: str, shard_keys: List[int], **kwargs: Any) -> None:
-        """No-op implementation."""
-        pass
-    
-    def on_rollback(self, transaction_id: str, shard_keys: List[int], reason: str, **kwargs: Any) -> None:
-        """No-op implementation."""
-        pass
     
-    def on_complete(self, transaction_id: str, state: TransactionState, duration_ms: float, **kwargs: Any) -> None:
-        """No-op implementation."""
-        pass
+    Every hook is the same module-level no-op stored as a staticmethod, so a
+    call never creates a bound method. Prefer the shared NULL_LOGGER instance;
+    callers can test ``logger is NULL_LOGGER`` to skip building log arguments.
+    """
     
-    def on_error(self, transaction_id: str, error: Exception, **kwargs: Any) -> None:
-        """No-op implementation."""
-        pass
+    on_prepare = staticmethod(_noop)
+    on_vote = staticmethod(_noop)
+    on_commit = staticmethod(_noop)
+    on_rollback = staticmethod(_noop)
+    on_complete = staticmethod(_noop)
+    on_error = staticmethod(_noop)
+
+
+# Shared null logger instance
+NULL_LOGGER = NullTransactionLogger()
+
+
+# Fixed slot per transaction state for TransactionMetrics.state_counts
+_STATE_IDX: Dict[TransactionState, int] = {state: i for i, state in enumerate(TransactionState)}
+
+# Final states counted as failures
+_FAILURE_STATES = frozenset({TransactionState.FAILED, TransactionState.ROLLED_BACK})
+
+# Per-slot increments for the success / failure counters
+_SUCCESS_MASK = tuple(int(state == TransactionState.COMMITTED) for state in _STATE_IDX)
+_FAIL_MASK = tuple(int(state in _FAILURE_STATES) for state in _STATE_IDX)
+
+# All-zero state_counts template, copied on init/reset
+_ZERO_STATE_COUNTS = array.array('q', [0] * len(_STATE_IDX))
 
 
 class TransactionMetrics:
@@ -202,14 +317,11 @@ class TransactionMetrics:
         self.successful_transactions = 0
         self.failed_transactions = 0
         self.total_duration_ms = 0.0
-        self.avg_duration_ms = 0.0
         self.min_duration_ms = float('inf')
         self.max_duration_ms = 0.0
         
-        # State tracking
-        self.state_counts: Dict[TransactionState, int] = {
-            state: 0 for state in TransactionState
-        }
+        # State tracking, one slot per state (see _STATE_IDX)
+        self.state_counts = _ZERO_STATE_COUNTS[:]
         
         # Error tracking
         self.error_counts: Dict[str, int] = {}
@@ -223,26 +335,31 @@ class TransactionMetrics:
             duration_ms: Transaction duration in milliseconds
             error: Exception if transaction failed
         """
+        idx = _STATE_IDX[state]
         self.total_transactions += 1
-        self.state_counts[state] += 1
+        self.state_counts[idx] += 1
         
         # Update duration statistics
         self.total_duration_ms += duration_ms
-        self.avg_duration_ms = self.total_duration_ms / self.total_transactions
-        self.min_duration_ms = min(self.min_duration_ms, duration_ms)
-        self.max_duration_ms = max(self.max_duration_ms, duration_ms)
+        if duration_ms < self.min_duration_ms:
+            self.min_duration_ms = duration_ms
+        if duration_ms > self.max_duration_ms:
+            self.max_duration_ms = duration_ms
         
         # Update success/failure counts
-        if state == TransactionState.COMMITTED:
-            self.successful_transactions += 1
-        elif state in [TransactionState.FAILED, TransactionState.ROLLED_BACK]:
-            self.failed_transactions += 1
+        self.successful_transactions += _SUCCESS_MASK[idx]
+        self.failed_transactions += _FAIL_MASK[idx]
         
         # Track errors
         if error:
             error_type = type(error).__name__
             self.error_counts[error_type] = self.error_counts.get(error_type, 0) + 1
     
+    @property
+    def avg_duration_ms(self) -> float:
+        """Average transaction duration in milliseconds, computed on read."""
+        return self.total_duration_ms / self.total_transactions if self.total_transactions else 0.0
+    
     def get_summary(self) -> Dict[str, Any]:
         """
         Get summary of transaction metrics.
@@ -258,7 +375,10 @@ class TransactionMetrics:
             'avg_duration_ms': self.avg_duration_ms,
             'min_duration_ms': self.min_duration_ms if self.min_duration_ms != float('inf') else 0,
             'max_duration_ms': self.max_duration_ms,
-            'state_distribution': {state.value: count for state, count in self.state_counts.items()},
+            'state_distribution': {
+                state.name: {'value': int(state), 'count': self.state_counts[idx]}
+                for state, idx in _STATE_IDX.items()
+            },
             'error_distribution': self.error_counts
         }
     
@@ -268,8 +388,7 @@ class TransactionMetrics:
         self.successful_transactions = 0
         self.failed_transactions = 0
         self.total_duration_ms = 0.0
-        self.avg_duration_ms = 0.0
         self.min_duration_ms = float('inf')
         self.max_duration_ms = 0.0
-        self.state_counts = {state: 0 for state in TransactionState}
+        self.state_counts = _ZERO_STATE_COUNTS[:]
         self.error_counts = {} 
\ No newline at end of file
@@ -2,24 +2,26 @@
 Transaction state and event enums for Shardlite transaction system.
 
 This module centralizes transaction state, event, and related enums.
+Both are IntEnums with fixed values so comparisons and hashing are plain
+integer operations.
 """
 
-from enum import Enum, auto
+from enum import IntEnum
 
-class TransactionState(Enum):
-    INITIAL = auto()
-    PREPARING = auto()
-    PREPARED = auto()
-    COMMITTING = auto()
-    COMMITTED = auto()
-    ROLLING_BACK = auto()
-    ROLLED_BACK = auto()
-    FAILED = auto()
+class TransactionState(IntEnum):
+    INITIAL = 1
+    PREPARING = 2
+    PREPARED = 3
+    COMMITTING = 4
+    COMMITTED = 5
+    ROLLING_BACK = 6
+    ROLLED_BACK = 7
+    FAILED = 8
 
-class TransactionEvent(Enum):
-    BEGIN = auto()
-    PREPARE = auto()
-    COMMIT = auto()
-    ROLLBACK = auto()
-    COMPLETE = auto()
-    ERROR = auto() 
\ No newline at end of file
+class TransactionEvent(IntEnum):
+    BEGIN = 1
+    PREPARE = 2
+    COMMIT = 3
+    ROLLBACK = 4
+    COMPLETE = 5
+    ERROR = 6
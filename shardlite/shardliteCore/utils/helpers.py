@@ -6,11 +6,30 @@ directory management, file validation, and data processing.
 """
 
 import os
+import re
+import operator
+import functools
 import sqlite3
+from itertools import chain
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
 
+# Identifier shape: letter or underscore, then letters, digits or underscores,
+# with at least one letter or digit (all-underscore names are rejected)
+_IDENT_RE = re.compile(r'(?!_*\Z)[A-Za-z_][A-Za-z0-9_]*\Z').match
+
+# Reserved words rejected as identifiers (compared upper-cased)
+_SQL_KEYWORDS = frozenset({
+    'SELECT', 'FROM', 'WHERE', 'INSERT', 'UPDATE', 'DELETE', 'CREATE',
+    'DROP', 'TABLE', 'INDEX', 'PRIMARY', 'KEY', 'FOREIGN', 'REFERENCES',
+    'UNIQUE', 'NOT', 'NULL', 'DEFAULT', 'CHECK', 'CONSTRAINT', 'ORDER',
+    'BY', 'GROUP', 'HAVING', 'LIMIT', 'OFFSET', 'JOIN', 'LEFT', 'RIGHT',
+    'INNER', 'OUTER', 'ON', 'AS', 'AND', 'OR', 'IN', 'EXISTS', 'BETWEEN',
+    'LIKE', 'IS', 'DISTINCT', 'COUNT', 'SUM', 'AVG', 'MAX', 'MIN'
+})
+
+
 def ensure_directory(path: str) -> None:
     """
     Ensure a directory exists, creating it if necessary.
@@ -27,6 +46,10 @@ def ensure_directory(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
+# Plain string concatenation matches os.path.join only with a single "/" separator
+_POSIX_SEP = os.sep == '/' and os.altsep is None
+
+
 def get_shard_filename(shard_id: int, db_dir: str) -> str:
     """
     Generate filename for a shard database.
@@ -47,16 +70,24 @@ def get_shard_filename(shard_id: int, db_dir: str) -> str:
     if not db_dir or not isinstance(db_dir, str):
         raise ValueError("db_dir must be a non-empty string")
     
-    filename = f"shard_{shard_id}.db"
-    return os.path.join(db_dir, filename)
+    if _POSIX_SEP:
+        # Same result as os.path.join for POSIX paths, without the call
+        sep = '' if db_dir.endswith('/') else '/'
+        return f"{db_dir}{sep}shard_{shard_id}.db"
+    
+    return os.path.join(db_dir, f"shard_{shard_id}.db")
 
 
-def validate_shard_files(shard_registry: Dict[int, str]) -> bool:
+def validate_shard_files(shard_registry: Dict[int, str], deep: bool = False) -> bool:
     """
     Validate that all shard files exist and are accessible.
     
+    By default each file is checked for read/write access and the SQLite
+    header magic, which avoids opening a database connection per shard.
+    
     Args:
         shard_registry: Mapping of shard ID to file path
+        deep: Also open each database and run a query
         
     Returns:
         bool: True if all shard files are valid, False otherwise
@@ -64,11 +95,44 @@ def validate_shard_files(shard_registry: Dict[int, str]) -> bool:
     if not shard_registry:
         return False
     
+    # Checked serially on purpose: each check is a few local syscalls, far
+    # cheaper than starting a thread pool (even with deep=True or 64 shards)
     for shard_id, db_path in shard_registry.items():
-        if not os.path.exists(db_path):
+        if not _check_shard_file(db_path, deep):
             return False
+    
+    return True
+
+
+# First 16 bytes of every non-empty SQLite 3 database file
+_SQLITE_HEADER = b'SQLite format 3\x00'
+
+
+def _check_shard_file(db_path: str, deep: bool = False) -> bool:
+    """
+    Check that a single shard file is an accessible SQLite database.
+    
+    Args:
+        db_path: Path to the shard database file
+        deep: Also open the database and run a query
         
-        # Try to open the database
+    Returns:
+        bool: True if the file is valid, False otherwise
+    """
+    if not os.access(db_path, os.R_OK | os.W_OK):
+        return False
+    
+    try:
+        with open(db_path, 'rb') as f:
+            header = f.read(16)
+    except OSError:
+        return False
+    
+    # A zero-length file is a valid, empty SQLite database
+    if header and header != _SQLITE_HEADER:
+        return False
+    
+    if deep:
         try:
             conn = sqlite3.connect(db_path)
             conn.execute("SELECT 1")
@@ -96,11 +160,15 @@ def get_file_size(file_path: str) -> int:
         raise ValueError("file_path must be a non-empty string")
     
     try:
-        return os.path.getsize(file_path)
+        return os.stat(file_path).st_size
     except OSError:
         return 0
 
 
+# (divisor, suffix) per unit, indexed by floor(log2(bytes) / 10)
+_BYTE_UNITS = ((1, 'B'), (1024, 'KB'), (1024 ** 2, 'MB'), (1024 ** 3, 'GB'))
+
+
 def format_bytes(bytes_value: int) -> str:
     """
     Format bytes into human-readable string.
@@ -111,14 +179,13 @@ def format_bytes(bytes_value: int) -> str:
     Returns:
         str: Human-readable string (e.g., "1.5 MB")
     """
-    if bytes_value < 1024:
+    # Each unit step is 2**10, so the bit length picks the unit directly
+    unit = min((max(int(bytes_value), 1).bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+    if unit == 0:
         return f"{bytes_value} B"
-    elif bytes_value < 1024 * 1024:
-        return f"{bytes_value / 1024:.1f} KB"
-    elif bytes_value < 1024 * 1024 * 1024:
-        return f"{bytes_value / (1024 * 1024):.1f} MB"
-    else:
-        return f"{bytes_value / (1024 * 1024 * 1024):.1f} GB"
+    
+    divisor, suffix = _BYTE_UNITS[unit]
+    return f"{bytes_value / divisor:.1f} {suffix}"
 
 
 def validate_sql_identifier(identifier: str) -> bool:
@@ -131,32 +198,17 @@ def validate_sql_identifier(identifier: str) -> bool:
     Returns:
         bool: True if valid SQL identifier, False otherwise
     """
-    if not identifier or not isinstance(identifier, str):
-        return False
-    
-    # Check for SQL keywords and invalid characters
-    sql_keywords = {
-        'SELECT', 'FROM', 'WHERE', 'INSERT', 'UPDATE', 'DELETE', 'CREATE',
-        'DROP', 'TABLE', 'INDEX', 'PRIMARY', 'KEY', 'FOREIGN', 'REFERENCES',
-        'UNIQUE', 'NOT', 'NULL', 'DEFAULT', 'CHECK', 'CONSTRAINT', 'ORDER',
-        'BY', 'GROUP', 'HAVING', 'LIMIT', 'OFFSET', 'JOIN', 'LEFT', 'RIGHT',
-        'INNER', 'OUTER', 'ON', 'AS', 'AND', 'OR', 'IN', 'EXISTS', 'BETWEEN',
-        'LIKE', 'IS', 'DISTINCT', 'COUNT', 'SUM', 'AVG', 'MAX', 'MIN'
-    }
-    
-    # Check if it's a SQL keyword
-    if identifier.upper() in sql_keywords:
-        return False
-    
-    # Check for valid characters (alphanumeric and underscore)
-    if not identifier.replace('_', '').isalnum():
-        return False
-    
-    # Check if it starts with a letter or underscore
-    if not (identifier[0].isalpha() or identifier[0] == '_'):
-        return False
-    
-    return True
+    return bool(identifier) and isinstance(identifier, str) and _is_valid_identifier(identifier)
+
+
+@functools.lru_cache(maxsize=1024)
+def _is_valid_identifier(identifier: str) -> bool:
+    """Cached shape and keyword check for a non-empty string identifier."""
+    return _IDENT_RE(identifier) is not None and identifier.upper() not in _SQL_KEYWORDS
+
+
+# Strips every character not allowed in a table name
+_UNSAFE_TABLE_CHARS = re.compile(r'[^A-Za-z0-9_]').sub
 
 
 def sanitize_table_name(table_name: str) -> str:
@@ -176,7 +228,7 @@ def sanitize_table_name(table_name: str) -> str:
         raise ValueError("table_name must be a non-empty string")
     
     # Remove any potentially dangerous characters
-    sanitized = ''.join(c for c in table_name if c.isalnum() or c == '_')
+    sanitized = _UNSAFE_TABLE_CHARS('', table_name)
     
     if not sanitized:
         raise ValueError("Table name contains no valid characters")
@@ -188,6 +240,13 @@ def sanitize_table_name(table_name: str) -> str:
     return sanitized
 
 
+def _check_columns(columns: List[str]) -> None:
+    """Raise ValueError for the first column name that is not a valid SQL identifier."""
+    for column in columns:
+        if not validate_sql_identifier(column):
+            raise ValueError(f"Invalid column name: {column}")
+
+
 def build_where_clause(where_dict: Dict[str, Any]) -> Tuple[str, List[Any]]:
     """
     Build WHERE clause from dictionary of conditions.
@@ -207,18 +266,10 @@ def build_where_clause(where_dict: Dict[str, Any]) -> Tuple[str, List[Any]]:
     if not isinstance(where_dict, dict):
         raise ValueError("where_dict must be a dictionary")
     
-    conditions = []
-    params = []
+    columns = list(where_dict)
+    _check_columns(columns)
     
-    for column, value in where_dict.items():
-        if not validate_sql_identifier(column):
-            raise ValueError(f"Invalid column name: {column}")
-        
-        conditions.append(f"{column} = ?")
-        params.append(value)
-    
-    where_clause = " AND ".join(conditions)
-    return where_clause, params
+    return " AND ".join(c + " = ?" for c in columns), list(where_dict.values())
 
 
 def build_set_clause(set_dict: Dict[str, Any]) -> Tuple[str, List[Any]]:
@@ -240,18 +291,14 @@ def build_set_clause(set_dict: Dict[str, Any]) -> Tuple[str, List[Any]]:
     if not isinstance(set_dict, dict):
         raise ValueError("set_dict must be a dictionary")
     
-    set_clauses = []
-    params = []
+    columns = list(set_dict)
+    _check_columns(columns)
     
-    for column, value in set_dict.items():
-        if not validate_sql_identifier(column):
-            raise ValueError(f"Invalid column name: {column}")
-        
-        set_clauses.append(f"{column} = ?")
-        params.append(value)
-    
-    set_clause = ", ".join(set_clauses)
-    return set_clause, params
+    return ", ".join(c + " = ?" for c in columns), list(set_dict.values())
+
+
+# Exact value types accepted for binding (None becomes NULL)
+_ROW_VALUE_TYPES = frozenset({str, int, float, bool, type(None)})
 
 
 def validate_row_data(row: Dict[str, Any]) -> bool:
@@ -264,25 +311,13 @@ def validate_row_data(row: Dict[str, Any]) -> bool:
     Returns:
         bool: True if row data is valid, False otherwise
     """
-    if not isinstance(row, dict):
-        return False
-    
-    if not row:
+    if not isinstance(row, dict) or not row:
         return False
     
-    for column, value in row.items():
-        if not validate_sql_identifier(column):
-            return False
-        
-        # Check for None values (use NULL in SQL)
-        if value is None:
-            continue
-        
-        # Check for basic data types
-        if not isinstance(value, (str, int, float, bool)):
-            return False
-    
-    return True
+    return all(
+        validate_sql_identifier(column) and type(value) in _ROW_VALUE_TYPES
+        for column, value in row.items()
+    )
 
 
 def merge_results(results_list: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
@@ -298,12 +333,16 @@ def merge_results(results_list: List[List[Dict[str, Any]]]) -> List[Dict[str, An
     if not results_list:
         return []
     
-    merged = []
-    for results in results_list:
-        if isinstance(results, list):
-            merged.extend(results)
-    
-    return merged
+    return list(chain.from_iterable(r for r in results_list if isinstance(r, list)))
+
+
+# Cross-shard combine function per aggregation type
+_AGG_COMBINERS = {
+    'sum': operator.add,
+    'count': operator.add,
+    'max': max,
+    'min': min,
+}
 
 
 def aggregate_results(results_list: List[Dict[str, Any]], agg_type: str) -> Dict[str, Any]:
@@ -320,6 +359,9 @@ def aggregate_results(results_list: List[Dict[str, Any]], agg_type: str) -> Dict
     if not results_list:
         return {}
     
+    # Resolve the combine function once; for avg (which needs per-shard
+    # counts) and unknown types, the first value seen is kept
+    combine = _AGG_COMBINERS.get(agg_type)
     aggregated = {}
     
     for result in results_list:
@@ -329,18 +371,8 @@ def aggregate_results(results_list: List[Dict[str, Any]], agg_type: str) -> Dict
         for key, value in result.items():
             if key not in aggregated:
                 aggregated[key] = value
-            else:
-                # Aggregate based on type
-                if agg_type == 'sum' and isinstance(value, (int, float)):
-                    aggregated[key] += value
-                elif agg_type == 'count' and isinstance(value, (int, float)):
-                    aggregated[key] += value
-                elif agg_type == 'max' and isinstance(value, (int, float)):
-                    aggregated[key] = max(aggregated[key], value)
-                elif agg_type == 'min' and isinstance(value, (int, float)):
-                    aggregated[key] = min(aggregated[key], value)
-                # For avg, we need to track count separately
-                # This is a simplified implementation
+            elif combine is not None and isinstance(value, (int, float)):
+                aggregated[key] = combine(aggregated[key], value)
     
     return aggregated
 
@@ -359,16 +391,10 @@ def calculate_shard_distribution(num_keys: int, num_shards: int) -> List[int]:
     if num_keys <= 0 or num_shards <= 0:
         return []
     
-    base_count = num_keys // num_shards
-    remainder = num_keys % num_shards
+    base_count, remainder = divmod(num_keys, num_shards)
     
-    distribution = [base_count] * num_shards
-    
-    # Distribute remainder
-    for i in range(remainder):
-        distribution[i] += 1
-    
-    return distribution
+    # The first `remainder` shards take one extra key
+    return [base_count + 1] * remainder + [base_count] * (num_shards - remainder)
 
 
 def check_disk_space(path: str, required_bytes: int) -> bool:
@@ -407,7 +433,10 @@ def get_database_info(db_path: str) -> Dict[str, Any]:
     if not db_path or not isinstance(db_path, str):
         raise ValueError("db_path must be a non-empty string")
     
-    if not os.path.exists(db_path):
+    # One stat() serves both the existence check and the size
+    try:
+        size = os.stat(db_path).st_size
+    except OSError:
         return {
             'exists': False,
             'size': 0,
@@ -431,14 +460,14 @@ def get_database_info(db_path: str) -> Dict[str, Any]:
         
         return {
             'exists': True,
-            'size': os.path.getsize(db_path),
+            'size': size,
             'tables': tables,
             'version': version
         }
     except sqlite3.Error as e:
         return {
             'exists': True,
-            'size': os.path.getsize(db_path),
+            'size': size,
             'tables': [],
             'version': None,
             'error': str(e)
@@ -3,6 +3,7 @@ import tempfile
 import yaml
 import pytest
 from shardlite.shardliteCore.config import ShardliteConfig
+from shardlite.shardliteCore.utils.helpers import get_shard_filename
 
 
 def test_config_from_dict_and_validation():
@@ -46,4 +47,17 @@ def test_shard_file_path_helpers(tmp_path):
     # get_all_shard_paths returns correct number
     all_paths = config.get_all_shard_paths()
     assert len(all_paths) == 2
-    assert path0 in all_paths.values() and path1 in all_paths.values() 
\ No newline at end of file
+    assert path0 in all_paths.values() and path1 in all_paths.values() 
+
+
+def test_get_shard_filename_matches_path_join(tmp_path):
+    db_dir = str(tmp_path)
+    for directory in (db_dir, db_dir + os.sep, "data", "."):
+        for shard_id in (0, 1, 42):
+            expected = os.path.join(directory, f"shard_{shard_id}.db")
+            assert get_shard_filename(shard_id, directory) == expected
+    # Invalid arguments are still rejected
+    with pytest.raises(ValueError):
+        get_shard_filename(-1, db_dir)
+    with pytest.raises(ValueError):
+        get_shard_filename(0, "")
@@ -8,6 +8,11 @@ This module tests the connection pooling functionality including:
 - Pool statistics
 - Error handling
 - Context manager functionality
+
+Tests that mutate the pool get their own uniquely named shared-cache
+in-memory database; read-only tests share one in-memory pool per process.
+Only the tests that need a real file (WAL, database creation) touch disk,
+so the module can run in parallel with pytest-xdist: ``pytest -n auto``.
 """
 
 import os
@@ -16,73 +21,198 @@ import sqlite3
 import threading
 import time
 import gc
+from concurrent.futures import ThreadPoolExecutor
 from uuid import uuid4
 from pathlib import Path
 
 from shardlite.shardliteCore.connection.pool import ConnectionPool
 
 
-@pytest.fixture(scope="function")
-def temp_db_path():
-    """Create a temporary database file for testing."""
-    base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../testing_data"))
-    os.makedirs(base_dir, exist_ok=True)
-    test_dir = os.path.join(base_dir, f"connection_pool_test_{uuid4().hex}")
-    os.makedirs(test_dir, exist_ok=True)
+def _create_test_table(conn):
+    """Create and fill the test table in one explicit transaction (autocommit connection)."""
+    conn.execute("BEGIN")
+    conn.execute("CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.executemany("INSERT INTO test (id, name) VALUES (?, ?)", [(1, 'test1'), (2, 'test2')])
+    conn.execute("COMMIT")
+
+
+@pytest.fixture(scope="module")
+def template_conn():
+    """Build the test schema once in memory; each test database is a copy of it."""
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    _create_test_table(conn)
     
-    db_path = os.path.join(test_dir, "test.db")
+    yield conn
     
-    # Initialize the database with a simple table
-    conn = sqlite3.connect(db_path)
-    conn.execute("CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT)")
-    conn.execute("INSERT INTO test (id, name) VALUES (1, 'test1')")
-    conn.execute("INSERT INTO test (id, name) VALUES (2, 'test2')")
-    conn.commit()
     conn.close()
+
+
+@pytest.fixture(scope="function")
+def temp_db_path(template_conn):
+    """Create a private shared-cache in-memory database; yields its URI."""
+    db_uri = f"file:pool_{uuid4().hex}?mode=memory&cache=shared"
     
-    yield db_path
+    # Initialize the database by copying the template's pages; the keeper
+    # connection keeps it alive until the test is done
+    keeper = sqlite3.connect(db_uri, uri=True)
+    template_conn.backup(keeper)
     
-    # Cleanup
-    try:
-        os.unlink(db_path)
-        os.rmdir(test_dir)
-    except (OSError, PermissionError):
-        # Handle Windows file locking issues
-        time.sleep(0.1)
-        try:
-            os.unlink(db_path)
-            os.rmdir(test_dir)
-        except Exception:
-            pass
+    yield db_uri
+    
+    keeper.close()
 
 
 @pytest.fixture(scope="function")
 def pool(temp_db_path):
     """Create a connection pool for testing."""
-    pool = ConnectionPool(temp_db_path, max_connections=3, timeout=5)  # Shorter timeout for testing
+    pool = ConnectionPool(temp_db_path, max_connections=3, timeout=5, uri=True)  # Shorter timeout for testing
+    yield pool
+    pool.close_all()
+
+
+@pytest.fixture(scope="function")
+def warm_pool(temp_db_path):
+    """Create a pool whose connections are all opened up front.
+
+    Connection setup (connect + PRAGMAs) happens here instead of inside the
+    timed part of the test.
+    """
+    pool = ConnectionPool(temp_db_path, max_connections=3, timeout=0.2, uri=True)
+    connections = [pool.get_connection() for _ in range(pool.max_connections)]
+    for conn in connections:
+        pool.return_connection(conn)
     yield pool
     pool.close_all()
 
 
+@pytest.fixture(scope="session")
+def shared_memory_pool():
+    """One pool over a shared-cache in-memory database for read-only tests.
+
+    Tests using it must not assume a fresh pool: compare stats against a
+    snapshot taken at the start of the test.
+    """
+    db_uri = "file:shardlite_test?mode=memory&cache=shared"
+    # The in-memory database lives as long as one connection to it is open
+    keeper = sqlite3.connect(db_uri, uri=True, isolation_level=None)
+    _create_test_table(keeper)
+    
+    pool = ConnectionPool(db_uri, max_connections=3, timeout=5, uri=True)
+    yield pool
+    pool.close_all()
+    keeper.close()
+
+
+def _expected_after_checkout(before):
+    """Expected (created, idle) stats once a shared-pool test has returned its connection."""
+    if before['pool_size'] > 0:
+        # An idle connection was reused; nothing new was opened
+        return before['total_connections_created'], before['pool_size']
+    # Nothing was idle, so the pool opened one connection and kept it
+    return before['total_connections_created'] + 1, 1
+
+
+def _check_initialization(pool, db_path):
+    """A new pool keeps its settings and has not opened any connections."""
+    assert pool.max_connections == 3
+    assert pool.timeout == 5
+    assert pool.db_path == db_path
+    assert pool.uri is True
+    stats = pool.get_pool_stats()
+    assert stats['active_connections'] == 0
+    assert stats['pool_size'] == 0
+    assert stats['total_connections_created'] == 0
+    assert stats['max_connections'] == 3
+    assert stats['db_path'] == db_path
+
+
+def _check_statistics(pool, db_path):
+    """Stats follow a connection out of and back into the pool."""
+    conn = pool.get_connection()
+    stats = pool.get_pool_stats()
+    assert stats['active_connections'] == 1
+    assert stats['pool_size'] == 0
+    assert stats['total_connections_created'] == 1
+    
+    pool.return_connection(conn)
+    stats = pool.get_pool_stats()
+    assert stats['active_connections'] == 0
+    assert stats['pool_size'] == 1
+    assert stats['total_connections_created'] == 1
+
+
+def _check_close_connection(pool, db_path):
+    """A closed connection is not returned to the pool."""
+    conn = pool.get_connection()
+    pool.close_connection(conn)
+    
+    stats = pool.get_pool_stats()
+    assert stats['total_connections_created'] == 1
+    assert stats['active_connections'] == 0
+    assert stats['pool_size'] == 0
+
+
+def _check_close_all(pool, db_path):
+    """close_all() drops idle and checked-out connections."""
+    connections = [pool.get_connection() for _ in range(3)]
+    for conn in connections[:2]:
+        pool.return_connection(conn)
+    
+    pool.close_all()
+    
+    stats = pool.get_pool_stats()
+    assert stats['total_connections_created'] == 3
+    assert stats['active_connections'] == 0
+    assert stats['pool_size'] == 0
+
+
+def _check_cleanup_with_active(pool, db_path):
+    """close_all() also resets connections that were never returned."""
+    conn1 = pool.get_connection()
+    conn2 = pool.get_connection()
+    
+    pool.close_all()
+    
+    stats = pool.get_pool_stats()
+    assert stats['total_connections_created'] == 2
+    assert stats['active_connections'] == 0
+    assert stats['pool_size'] == 0
+
+
+def _check_pool_context_manager(pool, db_path):
+    """Leaving the pool's own context closes it."""
+    with pool:
+        with pool.get_connection_context() as conn:
+            conn.execute("SELECT * FROM test").fetchall()
+    
+    stats = pool.get_pool_stats()
+    assert stats['active_connections'] == 0
+    assert stats['pool_size'] == 0
+
+
+_LIFECYCLE_SCENARIOS = {
+    "init": _check_initialization,
+    "statistics": _check_statistics,
+    "close_connection": _check_close_connection,
+    "close_all": _check_close_all,
+    "cleanup": _check_cleanup_with_active,
+    "context_manager": _check_pool_context_manager,
+}
+
+
 class TestConnectionPool:
     """Test cases for ConnectionPool class."""
 
-    def test_pool_initialization(self, temp_db_path):
-        """Test that pool initializes correctly."""
-        pool = ConnectionPool(temp_db_path, max_connections=5)
-        
-        assert pool.max_connections == 5
-        assert pool.db_path == temp_db_path
-        stats = pool.get_pool_stats()
-        assert stats['active_connections'] == 0
-        assert stats['pool_size'] == 0
-        assert stats['total_connections_created'] == 0
-        assert stats['max_connections'] == 5
-        
-        pool.close_all()
+    @pytest.mark.parametrize("scenario", list(_LIFECYCLE_SCENARIOS))
+    def test_pool_lifecycle(self, pool, temp_db_path, scenario):
+        """Test pool construction, statistics and shutdown on a fresh pool."""
+        _LIFECYCLE_SCENARIOS[scenario](pool, temp_db_path)
 
-    def test_get_and_return_connection(self, pool):
+    def test_get_and_return_connection(self, shared_memory_pool):
         """Test basic connection acquisition and return."""
+        pool = shared_memory_pool
+        before = pool.get_pool_stats()
+        
         # Get a connection
         conn = pool.get_connection()
         assert conn is not None
@@ -98,10 +228,11 @@ class TestConnectionPool:
         pool.return_connection(conn)
         
         # Check pool stats
+        created, idle = _expected_after_checkout(before)
         stats = pool.get_pool_stats()
         assert stats['active_connections'] == 0  # Connection returned
-        assert stats['pool_size'] == 1  # Connection in pool
-        assert stats['total_connections_created'] == 1
+        assert stats['pool_size'] == idle  # Connection in pool
+        assert stats['total_connections_created'] == created
 
     def test_multiple_connections(self, pool):
         """Test handling multiple connections."""
@@ -128,27 +259,29 @@ class TestConnectionPool:
         assert stats['pool_size'] == 3
         assert stats['active_connections'] == 0
 
-    def test_connection_reuse(self, pool):
+    def test_connection_reuse(self, shared_memory_pool):
         """Test that connections are properly reused."""
+        pool = shared_memory_pool
+        before = pool.get_pool_stats()
+        
         # Get and return a connection multiple times
         for _ in range(5):
             conn = pool.get_connection()
             pool.return_connection(conn)
         
-        # Should only have created one connection
+        # Repeated checkouts reuse the same connection
+        created, idle = _expected_after_checkout(before)
         stats = pool.get_pool_stats()
-        assert stats['total_connections_created'] == 1
-        assert stats['pool_size'] == 1
+        assert stats['total_connections_created'] == created
+        assert stats['pool_size'] == idle
         assert stats['active_connections'] == 0
 
-    def test_max_connections_limit(self, pool):
+    def test_max_connections_limit(self, warm_pool):
         """Test that pool respects max_connections limit."""
-        connections = []
+        pool = warm_pool
         
         # Get connections up to the limit
-        for i in range(3):
-            conn = pool.get_connection()
-            connections.append(conn)
+        connections = [pool.get_connection() for _ in range(3)]
         
         # Try to get one more connection - should timeout since we're at the limit
         start_time = time.time()
@@ -157,7 +290,7 @@ class TestConnectionPool:
         end_time = time.time()
         
         # Should have timed out after approximately the timeout period
-        assert end_time - start_time >= 4.0  # Allow some tolerance for 5-second timeout
+        assert 0.15 <= end_time - start_time < 0.5
         
         # Check pool stats
         stats = pool.get_pool_stats()
@@ -169,135 +302,84 @@ class TestConnectionPool:
         for conn in connections:
             pool.return_connection(conn)
 
-    def test_connection_context_manager(self, pool):
+    def test_connection_context_manager(self, shared_memory_pool):
         """Test connection context manager functionality."""
+        pool = shared_memory_pool
+        before = pool.get_pool_stats()
+        
         with pool.get_connection_context() as conn:
             cursor = conn.execute("SELECT * FROM test WHERE id = 1")
             row = cursor.fetchone()
             assert row[0] == 1
         
         # Connection should be returned to pool
+        _, idle = _expected_after_checkout(before)
         stats = pool.get_pool_stats()
-        assert stats['pool_size'] == 1
-        assert stats['active_connections'] == 0
-
-    def test_close_connection(self, pool):
-        """Test closing individual connections."""
-        conn = pool.get_connection()
-        pool.close_connection(conn)
-        
-        # Connection should be removed from pool
-        stats = pool.get_pool_stats()
-        assert stats['total_connections_created'] == 1
-        assert stats['active_connections'] == 0
-        assert stats['pool_size'] == 0
-
-    def test_close_all_connections(self, pool):
-        """Test closing all connections."""
-        # Get multiple connections
-        connections = []
-        for i in range(3):
-            conn = pool.get_connection()
-            connections.append(conn)
-        
-        # Return some connections
-        for conn in connections[:2]:
-            pool.return_connection(conn)
-        
-        # Close all connections
-        pool.close_all()
-        
-        # All connections should be closed
-        stats = pool.get_pool_stats()
-        assert stats['total_connections_created'] == 3
+        assert stats['pool_size'] == idle
         assert stats['active_connections'] == 0
-        assert stats['pool_size'] == 0
-
-    def test_pool_statistics(self, pool):
-        """Test pool statistics tracking."""
-        # Initial stats
-        stats = pool.get_pool_stats()
-        assert stats['active_connections'] == 0
-        assert stats['pool_size'] == 0
-        assert stats['max_connections'] == 3
-        assert stats['total_connections_created'] == 0
-        
-        # Get a connection
-        conn = pool.get_connection()
-        stats = pool.get_pool_stats()
-        assert stats['active_connections'] == 1
-        assert stats['pool_size'] == 0
-        assert stats['total_connections_created'] == 1
-        
-        # Return connection
-        pool.return_connection(conn)
-        stats = pool.get_pool_stats()
-        assert stats['active_connections'] == 0
-        assert stats['pool_size'] == 1
-        assert stats['total_connections_created'] == 1
-
-    def test_invalid_database_path(self):
-        """Test behavior with invalid database path."""
-        with pytest.raises(ValueError):
-            ConnectionPool("", max_connections=3)
-        
-        with pytest.raises(ValueError):
-            ConnectionPool(None, max_connections=3)
 
-    def test_invalid_max_connections(self, temp_db_path):
-        """Test behavior with invalid max_connections."""
-        with pytest.raises(ValueError):
-            ConnectionPool(temp_db_path, max_connections=0)
-        
-        with pytest.raises(ValueError):
-            ConnectionPool(temp_db_path, max_connections=-1)
-
-    def test_invalid_timeout(self, temp_db_path):
-        """Test behavior with invalid timeout."""
-        with pytest.raises(ValueError):
-            ConnectionPool(temp_db_path, max_connections=3, timeout=0)
-        
+    @pytest.mark.parametrize("kwargs", [
+        {"db_path": ""},
+        {"db_path": None},
+        {"db_path": "test.db", "max_connections": 0},
+        {"db_path": "test.db", "max_connections": -1},
+        {"db_path": "test.db", "timeout": 0},
+        {"db_path": "test.db", "timeout": -1},
+    ], ids=["empty-path", "none-path", "zero-max", "negative-max", "zero-timeout", "negative-timeout"])
+    def test_invalid_arguments(self, kwargs):
+        """Test that invalid constructor arguments are rejected."""
+        # Validation happens before any connection is opened
         with pytest.raises(ValueError):
-            ConnectionPool(temp_db_path, max_connections=3, timeout=-1)
+            ConnectionPool(**{"max_connections": 3, **kwargs})
 
-    def test_connection_health_check(self, pool):
+    def test_connection_health_check(self, shared_memory_pool):
         """Test connection health monitoring."""
+        pool = shared_memory_pool
+        before = pool.get_pool_stats()
+        
         # Get a connection and use it
         with pool.get_connection_context() as conn:
             cursor = conn.execute("SELECT * FROM test")
             cursor.fetchall()
         
         # Connection should be healthy
+        created, idle = _expected_after_checkout(before)
         stats = pool.get_pool_stats()
-        assert stats['total_connections_created'] == 1
-        assert stats['pool_size'] == 1
+        assert stats['total_connections_created'] == created
+        assert stats['pool_size'] == idle
         assert stats['active_connections'] == 0
 
-    def test_concurrent_access(self, pool):
+    def test_concurrent_access(self, warm_pool):
         """Test thread safety with concurrent access."""
+        pool = warm_pool
         results = []
         errors = []
         
+        # Workers hold their connections until the main thread has seen all three checked out
+        acquired = threading.Barrier(4)
+        hold = threading.Event()
+        
         def worker(worker_id):
             try:
                 with pool.get_connection_context() as conn:
                     cursor = conn.execute("SELECT * FROM test WHERE id = 1")
                     row = cursor.fetchone()
                     results.append((worker_id, row[0]))
-                    time.sleep(0.001)  # Shorter work simulation
+                    acquired.wait()
+                    hold.wait(timeout=1)
             except Exception as e:
+                acquired.abort()
                 errors.append((worker_id, str(e)))
         
-        # Create fewer threads to avoid timeouts
-        threads = []
-        for i in range(3):  # Reduced from 5 to 3
-            thread = threading.Thread(target=worker, args=(i,))
-            threads.append(thread)
-            thread.start()
-        
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(worker, i) for i in range(3)]
+            try:
+                acquired.wait(timeout=5)
+                assert pool.get_pool_stats()['active_connections'] == 3
+            finally:
+                hold.set()
+            for future in futures:
+                future.result()
         
         # Check results
         assert len(errors) == 0, f"Errors occurred: {errors}"
@@ -309,32 +391,24 @@ class TestConnectionPool:
         
         # Check pool stats
         stats = pool.get_pool_stats()
-        assert stats['total_connections_created'] >= 1
-        assert stats['pool_size'] >= 1
+        assert stats['total_connections_created'] == 3
+        assert stats['pool_size'] == 3
         assert stats['active_connections'] == 0
 
-    def test_connection_pool_with_nonexistent_db(self):
+    def test_connection_pool_with_nonexistent_db(self, tmp_path):
         """Test pool behavior with non-existent database."""
         # Should create the database file
-        db_path = "test_nonexistent.db"
-        
-        try:
-            pool = ConnectionPool(db_path, max_connections=2)
-            
-            # Should be able to get a connection
-            with pool.get_connection_context() as conn:
-                cursor = conn.execute("CREATE TABLE test_new (id INTEGER PRIMARY KEY)")
-                cursor.execute("INSERT INTO test_new (id) VALUES (1)")
-                conn.commit()
-            
-            pool.close_all()
-            
-        finally:
-            # Cleanup
-            try:
-                os.unlink(db_path)
-            except OSError:
-                pass
+        db_path = str(tmp_path / "test_nonexistent.db")
+        pool = ConnectionPool(db_path, max_connections=2)
+        
+        # Should be able to get a connection
+        with pool.get_connection_context() as conn:
+            cursor = conn.execute("CREATE TABLE test_new (id INTEGER PRIMARY KEY)")
+            cursor.execute("INSERT INTO test_new (id) VALUES (1)")
+            conn.commit()
+        
+        pool.close_all()
+        assert os.path.exists(db_path)
 
     def test_return_invalid_connection(self, pool):
         """Test returning an invalid connection."""
@@ -352,37 +426,9 @@ class TestConnectionPool:
             cursor = new_conn.execute("SELECT * FROM test")
             cursor.fetchall()
 
-    def test_pool_cleanup_on_exit(self, temp_db_path):
-        """Test that pool properly cleans up on exit."""
-        pool = ConnectionPool(temp_db_path, max_connections=2)
-        
-        # Get some connections
-        conn1 = pool.get_connection()
-        conn2 = pool.get_connection()
-        
-        # Close pool
-        pool.close_all()
-        
-        # Connections should be closed
-        stats = pool.get_pool_stats()
-        assert stats['total_connections_created'] == 2
-        assert stats['active_connections'] == 0
-        assert stats['pool_size'] == 0
-
-    def test_pool_context_manager(self, temp_db_path):
-        """Test pool as context manager."""
-        with ConnectionPool(temp_db_path, max_connections=2) as pool:
-            # Pool should be functional
-            with pool.get_connection_context() as conn:
-                cursor = conn.execute("SELECT * FROM test")
-                cursor.fetchall()
-        
-        # Pool should be closed after context exit
-        # Note: We can't check stats after close_all() as the pool is closed
-
     def test_connection_timeout(self, temp_db_path):
         """Test connection timeout behavior."""
-        pool = ConnectionPool(temp_db_path, max_connections=1, timeout=1)
+        pool = ConnectionPool(temp_db_path, max_connections=1, timeout=0.2, uri=True)
         
         # Get the only connection
         conn1 = pool.get_connection()
@@ -393,21 +439,21 @@ class TestConnectionPool:
             conn2 = pool.get_connection()
         end_time = time.time()
         
-        # Should have timed out after approximately 1 second
-        assert end_time - start_time >= 0.9  # Allow some tolerance
+        # Should have timed out after approximately 0.2 seconds
+        assert end_time - start_time >= 0.15  # Allow some tolerance
         
         pool.return_connection(conn1)
         pool.close_all()
 
-    def test_sqlite_configuration(self, pool):
+    def test_sqlite_configuration(self, tmp_path):
         """Test that SQLite connections are properly configured."""
+        # WAL needs a database file; in-memory databases report 'memory'
+        pool = ConnectionPool(str(tmp_path / "test.db"), max_connections=1)
         with pool.get_connection_context() as conn:
-            # Check that foreign keys are enabled
-            cursor = conn.execute("PRAGMA foreign_keys")
-            foreign_keys = cursor.fetchone()[0]
+            # Read both settings in one statement via the pragma table functions
+            cursor = conn.execute("SELECT * FROM pragma_foreign_keys, pragma_journal_mode")
+            foreign_keys, journal_mode = cursor.fetchone()
             assert foreign_keys == 1
-            
-            # Check journal mode
-            cursor = conn.execute("PRAGMA journal_mode")
-            journal_mode = cursor.fetchone()[0]
-            assert journal_mode.upper() == "WAL" 
\ No newline at end of file
+            assert journal_mode.upper() == "WAL"
+        
+        pool.close_all()
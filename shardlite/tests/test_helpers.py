@@ -0,0 +1,12 @@
+import pytest
+from shardlite.shardliteCore.utils.helpers import validate_sql_identifier
+
+
+@pytest.mark.parametrize("identifier", ["id", "_id", "user_name", "col2", "_1"])
+def test_validate_sql_identifier_accepts(identifier):
+    assert validate_sql_identifier(identifier) is True
+
+
+@pytest.mark.parametrize("identifier", ["", "_", "__", "1col", "user-name", "select", "id\n", None])
+def test_validate_sql_identifier_rejects(identifier):
+    assert validate_sql_identifier(identifier) is False
@@ -0,0 +1,57 @@
+import gc
+import json
+import pytest
+from shardlite.shardliteCore.transaction import logger as logger_module
+from shardlite.shardliteCore.transaction.logger import ConsoleTransactionLogger, TransactionMetrics
+from shardlite.shardliteCore.transaction.transaction_states import TransactionState
+
+
+def test_console_logger_flush_writes_lines(capsys):
+    logger = ConsoleTransactionLogger(verbose=False)
+    logger.on_commit("tx-1", [1, 2])
+    logger.on_error("tx-1", ValueError("boom"))
+    logger.flush()
+    out = capsys.readouterr().out.splitlines()
+    assert len(out) == 2
+    assert out[0].endswith("TX tx-1: COMMIT phase started for shards 1,2")
+    assert out[1].endswith("TX tx-1: ERROR - ValueError: boom")
+
+
+def test_exit_hook_tracks_only_live_loggers(capsys):
+    baseline = len(logger_module._live_loggers)
+    loggers = [ConsoleTransactionLogger(verbose=False) for _ in range(50)]
+    assert len(logger_module._live_loggers) == baseline + 50
+    
+    loggers[0].on_prepare("tx-2", [3])
+    logger_module._flush_live_loggers()
+    assert "TX tx-2: PREPARE phase started for shards 3" in capsys.readouterr().out
+    
+    del loggers
+    gc.collect()
+    assert len(logger_module._live_loggers) == baseline
+
+
+def test_metrics_summary():
+    metrics = TransactionMetrics()
+    metrics.record_transaction(TransactionState.COMMITTED, 10.0)
+    metrics.record_transaction(TransactionState.COMMITTED, 30.0)
+    metrics.record_transaction(TransactionState.FAILED, 5.0, error=ValueError("boom"))
+    metrics.record_transaction(TransactionState.ROLLED_BACK, 15.0)
+    
+    summary = metrics.get_summary()
+    assert summary['total_transactions'] == 4
+    assert summary['successful_transactions'] == 2
+    assert summary['failed_transactions'] == 2
+    assert summary['success_rate'] == pytest.approx(50.0)
+    assert summary['avg_duration_ms'] == pytest.approx(15.0)
+    assert summary['min_duration_ms'] == 5.0
+    assert summary['max_duration_ms'] == 30.0
+    assert summary['error_distribution'] == {'ValueError': 1}
+    
+    distribution = summary['state_distribution']
+    assert list(distribution) == [state.name for state in TransactionState]
+    assert distribution['COMMITTED'] == {'value': int(TransactionState.COMMITTED), 'count': 2}
+    assert distribution['FAILED']['count'] == 1
+    assert distribution['INITIAL']['count'] == 0
+    # Keys stay readable once serialized
+    assert json.loads(json.dumps(summary))['state_distribution'] == distribution
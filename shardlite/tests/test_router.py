@@ -1,20 +1,12 @@
-import os
-import shutil
 import pytest
-import time
-import gc
-from uuid import uuid4
 from shardlite.shardliteCore.manager import ShardManager
 from shardlite.shardliteCore.router.router import Router
 from shardlite.shardliteCore.strategy.hash_strategy import HashShardingStrategy
 from shardlite.shardliteCore.config import ShardliteConfig
 
 @pytest.fixture(scope="function")
-def temp_router():
-    base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../testing_data"))
-    os.makedirs(base_dir, exist_ok=True)
-    test_dir = os.path.join(base_dir, f"router_test_{uuid4().hex}")
-    os.makedirs(test_dir, exist_ok=True)
+def temp_router(tmp_path_factory):
+    test_dir = str(tmp_path_factory.mktemp("router_test"))
     config = ShardliteConfig(num_shards=3, db_dir=test_dir, auto_create_dirs=True)
     strategy = HashShardingStrategy(num_shards=3)
     manager = ShardManager(config, strategy)
@@ -22,17 +14,24 @@ def temp_router():
     try:
         yield router, manager
     finally:
+        for pool in router.connection_pools.values():
+            pool.close_all()
+        router.connection_pools.clear()
         manager.shutdown()
-        gc.collect()
-        time.sleep(0.1)
-        def on_rm_error(func, path, exc_info):
-            if isinstance(exc_info[1], PermissionError):
-                time.sleep(0.1)
-                try:
-                    func(path)
-                except Exception:
-                    pass
-        shutil.rmtree(test_dir, onerror=on_rm_error)
+
+
+def _bulk_insert(router, table, rows):
+    """Insert rows with one executemany transaction per shard."""
+    # Bucket rows by shard, keeping the first key to look up each shard's pool
+    buckets = {}
+    for row in rows:
+        shard_id = router.strategy.get_shard_id(row["id"])
+        _, params = buckets.setdefault(shard_id, (row["id"], []))
+        params.append((row["id"], row["value"]))
+    for first_key, params in buckets.values():
+        with router.get_connection_for_key(first_key).get_connection_context() as conn:
+            with conn:
+                conn.executemany(f"INSERT INTO {table} (id, value) VALUES (?, ?)", params)
 
 
 def test_route_insert_and_select(temp_router):
@@ -40,8 +39,8 @@ def test_route_insert_and_select(temp_router):
     # Create table on all shards
     manager.apply_schema("CREATE TABLE test (id INTEGER PRIMARY KEY, value TEXT)")
     # Insert into different shards
-    for i in range(6):
-        router.route_insert("test", {"id": i, "value": f"val{i}"}, key=i)
+    _bulk_insert(router, "test", [{"id": i, "value": f"val{i}"} for i in range(5)])
+    router.route_insert("test", {"id": 5, "value": "val5"}, key=5)
     # Select from all shards
     all_rows = router.route_select("test")
     assert len(all_rows) == 6
@@ -54,8 +53,7 @@ def test_route_insert_and_select(temp_router):
 def test_route_update_and_delete(temp_router):
     router, manager = temp_router
     manager.apply_schema("CREATE TABLE test (id INTEGER PRIMARY KEY, value TEXT)")
-    for i in range(3):
-        router.route_insert("test", {"id": i, "value": "old"}, key=i)
+    _bulk_insert(router, "test", [{"id": i, "value": "old"} for i in range(3)])
     # Update one row
     affected = router.route_update("test", {"value": "new"}, where={"id": 1}, key=1)
     assert affected == 1
@@ -71,8 +69,7 @@ def test_route_update_and_delete(temp_router):
 def test_route_aggregate(temp_router):
     router, manager = temp_router
     manager.apply_schema("CREATE TABLE test (id INTEGER PRIMARY KEY, value INTEGER)")
-    for i in range(6):
-        router.route_insert("test", {"id": i, "value": i * 10}, key=i)
+    _bulk_insert(router, "test", [{"id": i, "value": i * 10} for i in range(6)])
     # COUNT
     count = router.route_aggregate("test", "COUNT(*)")
     assert count["COUNT(*)"] == 6
@@ -87,4 +84,24 @@ def test_route_aggregate(temp_router):
     assert maxv["MAX(value)"] == 50
     # MIN
     minv = router.route_aggregate("test", "MIN(value)")
-    assert minv["MIN(value)"] == 0 
\ No newline at end of file
+    assert minv["MIN(value)"] == 0 
+
+def test_route_multi_aggregate(temp_router):
+    router, manager = temp_router
+    manager.apply_schema("CREATE TABLE test (id INTEGER PRIMARY KEY, value INTEGER)")
+    exprs = ["COUNT(*)", "SUM(value)", "AVG(value)", "MAX(value)", "MIN(value)"]
+    # Empty table: same answers as route_aggregate
+    empty = router.route_multi_aggregate("test", exprs)
+    assert empty == {"COUNT(*)": 0, "SUM(value)": None, "AVG(value)": 0,
+                     "MAX(value)": None, "MIN(value)": None}
+    assert empty == {expr: router.route_aggregate("test", expr)[expr] for expr in exprs}
+    
+    _bulk_insert(router, "test", [{"id": i, "value": i * 10} for i in range(6)])
+    # One query per shard, matching the per-expression results
+    batched = router.route_multi_aggregate("test", exprs)
+    for expr in exprs:
+        assert batched[expr] == pytest.approx(router.route_aggregate("test", expr)[expr])
+    assert batched["AVG(value)"] == pytest.approx(25.0)
+    
+    with pytest.raises(ValueError):
+        router.route_multi_aggregate("test", [])
@@ -0,0 +1,200 @@
+import threading
+import pytest
+from shardlite.shardliteCore.manager import ShardManager
+from shardlite.shardliteCore.strategy.hash_strategy import HashShardingStrategy
+from shardlite.shardliteCore.config import ShardliteConfig
+from shardlite.shardliteCore.transaction.coordinator import ParallelTransactionCoordinator
+from shardlite.shardliteCore.transaction.logger import NullTransactionLogger
+from shardlite.shardliteCore.transaction.transaction_states import TransactionState
+
+
+@pytest.fixture(scope="function")
+def manager(tmp_path):
+    config = ShardliteConfig(num_shards=3, db_dir=str(tmp_path), auto_create_dirs=True)
+    manager = ShardManager(config, HashShardingStrategy(num_shards=3))
+    try:
+        yield manager
+    finally:
+        manager.shutdown()
+
+
+def test_transaction_ids_unique_across_coordinators(manager):
+    # Each custom-logger transaction gets its own coordinator
+    contexts = [manager.transaction([1], logger=NullTransactionLogger()) for _ in range(3)]
+    contexts.append(manager.coordinator.begin([1]))
+    ids = [context.transaction_id for context in contexts]
+    assert all(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_begin_tracks_transaction_id(manager):
+    coordinator = manager.coordinator
+    context = coordinator.begin([1, 2])
+    assert context.logger is coordinator.logger
+    assert coordinator.get_active_transactions() == [context.transaction_id]
+    coordinator.rollback(context)
+    assert coordinator.get_active_transactions() == []
+
+
+def _shard_connections_idle(manager, keys):
+    for key in keys:
+        with manager.router.get_connection_for_key(key).get_connection_context() as conn:
+            if conn.in_transaction:
+                return False
+    return True
+
+
+def test_single_shard_commit(manager):
+    coordinator = manager.coordinator
+    context = coordinator.begin([1])
+    assert coordinator.commit(context) is True
+    assert context.state == TransactionState.COMMITTED
+    assert coordinator.get_active_transactions() == []
+    # One-phase path runs on the calling thread
+    assert coordinator._executor is None
+    assert _shard_connections_idle(manager, [1])
+
+
+def test_multi_shard_commit(manager):
+    coordinator = manager.coordinator
+    # Keys 1 and 2 live on different shards
+    context = coordinator.begin([1, 2])
+    assert coordinator.commit(context) is True
+    assert context.state == TransactionState.COMMITTED
+    assert coordinator.get_active_transactions() == []
+    assert _shard_connections_idle(manager, [1, 2])
+
+
+def test_keys_on_one_shard_commit_in_one_phase(manager):
+    coordinator = manager.coordinator
+    # Keys 1 and 4 share shard 1
+    context = coordinator.begin([1, 4])
+    assert coordinator.commit(context) is True
+    assert context.state == TransactionState.COMMITTED
+    assert coordinator._executor is None
+    assert _shard_connections_idle(manager, [1])
+
+
+def test_multi_shard_commit_with_shared_shard(manager):
+    coordinator = manager.coordinator
+    # Keys 1 and 4 share shard 1; each shard is prepared once
+    context = coordinator.begin([1, 2, 4])
+    assert coordinator.commit(context) is True
+    assert context.state == TransactionState.COMMITTED
+    assert _shard_connections_idle(manager, [1, 2])
+
+
+def test_single_shard_commit_recovers_stale_connection(manager):
+    # Simulate a connection returned to the pool with a transaction still open
+    pool = manager.router.get_connection_for_key(1)
+    with pool.get_connection_context() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+    
+    coordinator = manager.coordinator
+    assert coordinator.commit(coordinator.begin([1])) is True
+    assert _shard_connections_idle(manager, [1])
+
+def test_run_groups_operations_by_shard(manager):
+    calls = []
+    
+    def record(label):
+        return lambda: calls.append((label, threading.get_ident()))
+    
+    # Keys 1 and 4 share shard 1; key 2 is on shard 2
+    operations = [
+        (1, record("a1")),
+        record("bare1"),
+        (2, record("b1")),
+        (4, record("a2")),
+        record("bare2"),
+        (1, record("a3")),
+    ]
+    assert manager.coordinator.run([1, 2, 4], operations) is True
+    assert manager.coordinator.get_active_transactions() == []
+    
+    labels = [label for label, _ in calls]
+    threads = dict(calls)
+    # Bare callables run first, in order, on the calling thread
+    assert labels[:2] == ["bare1", "bare2"]
+    assert threads["bare1"] == threads["bare2"] == threading.get_ident()
+    # Each shard's operations keep their order and share one worker
+    assert [label for label in labels if label.startswith("a")] == ["a1", "a2", "a3"]
+    assert threads["a1"] == threads["a2"] == threads["a3"] != threading.get_ident()
+    assert "b1" in labels
+
+
+def test_run_waits_for_all_shards_on_failure(manager):
+    errors = []
+    
+    class RecordingLogger(NullTransactionLogger):
+        def on_error(self, transaction_id, error, **kwargs):
+            errors.append((transaction_id, error))
+    
+    coordinator = ParallelTransactionCoordinator(manager, RecordingLogger())
+    release = threading.Event()
+    finished = []
+    
+    def slow():
+        release.wait(timeout=1)
+        finished.append(True)
+    
+    def failing():
+        release.set()
+        raise RuntimeError("shard write failed")
+    
+    try:
+        # Keys 1 and 2 live on different shards
+        assert coordinator.run([1, 2], [(1, failing), (2, slow)]) is False
+        # The other shard had finished by the time run() returned
+        assert finished == [True]
+        assert len(errors) == 1
+        transaction_id, error = errors[0]
+        assert transaction_id
+        assert isinstance(error, RuntimeError)
+        assert coordinator.get_active_transactions() == []
+    finally:
+        coordinator.shutdown()
+
+
+def test_run_skips_shard_groups_when_bare_operation_fails(manager):
+    ran = []
+    
+    def failing():
+        raise RuntimeError("bare operation failed")
+    
+    operations = [failing, (1, lambda: ran.append(1))]
+    assert manager.coordinator.run([1], operations) is False
+    assert ran == []
+    assert manager.coordinator.get_active_transactions() == []
+
+
+def test_run_finalizes_transaction(manager):
+    states = []
+    
+    class RecordingLogger(NullTransactionLogger):
+        def on_complete(self, transaction_id, state, duration_ms, **kwargs):
+            states.append(state)
+    
+    coordinator = ParallelTransactionCoordinator(manager, RecordingLogger())
+    try:
+        assert coordinator.run([1], [(1, lambda: None)]) is True
+        assert coordinator.run([1], [lambda: 1 / 0]) is False
+        assert states == [TransactionState.COMMITTED, TransactionState.ROLLED_BACK]
+        assert coordinator.get_active_transactions() == []
+        assert _shard_connections_idle(manager, [1])
+    finally:
+        coordinator.shutdown()
+
+
+def test_custom_logger_transaction_borrows_pool_lazily(manager):
+    single = manager.transaction([1], logger=NullTransactionLogger())
+    assert single.coordinator.commit(single) is True
+    # A single-shard transaction starts no worker threads anywhere
+    assert manager.coordinator._executor is None
+    
+    multi = manager.transaction([1, 2], logger=NullTransactionLogger())
+    assert multi.coordinator.commit(multi) is True
+    # The parallel phases ran on the manager coordinator's pool
+    assert manager.coordinator._executor is not None
+    assert multi.coordinator.executor is manager.coordinator.executor
+    assert multi.coordinator._executor is None